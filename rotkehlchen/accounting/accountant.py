@@ -123,12 +123,14 @@ class Accountant():
             # Create a new pnl report in the DB to be used to save each event generated
             dbpnl = DBAccountingReports(self.db)
             first_ts = Timestamp(0) if len(events) == 0 else events[0].get_timestamp()
-            report_id = dbpnl.add_report(
-                first_processed_timestamp=first_ts,
-                start_ts=start_ts,
-                end_ts=end_ts,
-                settings=db_settings,
-            )
+            with self.db.transient_write() as write_cursor:
+                report_id = dbpnl.add_report(
+                    write_cursor=write_cursor,
+                    first_processed_timestamp=first_ts,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                    settings=db_settings,
+                )
             self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id)  # noqa: E501
             self.end_ts = end_ts
             self.csvexporter.reset(start_ts=start_ts, end_ts=end_ts)
@@ -201,13 +203,17 @@ class Accountant():
                 )
                 break
 
-        dbpnl.add_report_overview(
-            report_id=report_id,
-            last_processed_timestamp=last_event_ts,
-            processed_actions=count,
-            total_actions=actions_length,
-            pnls=self.pots[0].pnls,
-        )
+        # write the last batch of events and the overview with a single transaction
+        with self.db.transient_write() as write_cursor:
+            self.pots[0].save_processed_events(write_cursor)
+            dbpnl.add_report_overview(
+                write_cursor=write_cursor,
+                report_id=report_id,
+                last_processed_timestamp=last_event_ts,
+                processed_actions=count,
+                total_actions=actions_length,
+                pnls=self.pots[0].pnls,
+            )
         return report_id
 
     def _process_event(
@@ -1,2 +1,4 @@
 FREE_PNL_EVENTS_LIMIT = 1000
 FREE_REPORTS_LOOKUP_LIMIT = 20
+# Amount of processed events accumulated before writing them to the report in the DB
+PNL_EVENTS_DB_WRITE_BATCH_SIZE = 1000
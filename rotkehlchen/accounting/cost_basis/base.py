@@ -1,8 +1,8 @@
 import heapq
 import logging
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict
-from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -35,17 +35,56 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Identifiers of assets that share the cost basis of another asset
+COST_BASIS_EQUIVALENT_ASSETS = {A_WETH.identifier: A_ETH.identifier}
+
+
+def _cost_basis_identifier(asset: Asset) -> str:
+    """Returns the identifier under which the cost basis events of the asset are kept"""
+    identifier = asset.identifier
+    return COST_BASIS_EQUIVALENT_ASSETS.get(identifier, identifier)
+
 
-@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class AssetAcquisitionEvent:
-    amount: FVal
-    remaining_amount: FVal = field(init=False)  # Same as amount but reduced during processing
-    timestamp: Timestamp
-    rate: Price
-    index: int
+    """An acquisition of an asset that spends are matched against
 
-    def __post_init__(self) -> None:
-        self.remaining_amount = self.amount
+    A report can hold a very large number of acquisitions so this is a slotted class
+    instead of a dataclass since dataclasses can't have slots together with the
+    init=False remaining_amount field in python 3.9.
+    """
+    __slots__ = ('amount', 'remaining_amount', 'timestamp', 'rate', 'index')
+
+    def __init__(
+            self,
+            amount: FVal,
+            timestamp: Timestamp,
+            rate: Price,
+            index: int,
+    ) -> None:
+        self.amount = amount
+        self.remaining_amount = amount  # Same as amount but reduced during processing
+        self.timestamp = timestamp
+        self.rate = rate
+        self.index = index
+
+    def __repr__(self) -> str:
+        return (
+            f'AssetAcquisitionEvent(amount={self.amount!r}, '
+            f'remaining_amount={self.remaining_amount!r}, timestamp={self.timestamp!r}, '
+            f'rate={self.rate!r}, index={self.index!r})'
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AssetAcquisitionEvent):
+            return NotImplemented
+
+        return (
+            self.amount, self.remaining_amount, self.timestamp, self.rate, self.index,
+        ) == (
+            other.amount, other.remaining_amount, other.timestamp, other.rate, other.index,
+        )
+
+    __hash__ = None  # type: ignore  # mutable so not hashable, same as an eq dataclass
 
     def __str__(self) -> str:
         return (
@@ -97,6 +136,7 @@ class AssetAcquisitionEvent:
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class AssetSpendEvent:
+    __slots__ = ('timestamp', 'location', 'amount', 'rate')
     timestamp: Timestamp
     location: Location
     amount: FVal  # Amount of the asset we sell
@@ -119,20 +159,25 @@ class AssetAcquisitionHeapElement(NamedTuple):
 
     Note:`heapq` uses a min heap implementation i.e. the smallest item comes out first.
 
-    For FIFO, a counter is used as the priority so the first acquisition comes out first.
-    For LIFO, a counter is used but negated, so the acquisition added last comes first.
+    FIFO and LIFO do not use the heap since acquisitions are consumed in the order
+    they are added or in the reverse order respectively.
     For HIFO, the amount of the acquisition is used although negated so the
     acquisition with the highest amount comes first.
+
+    The insertion index breaks ties between equal priorities. That way acquisitions
+    with the same priority come out in the order they were added and the acquisition
+    events themselves never need to be compared by the heap.
     """
     priority: FVal  # This is only used by heapq algorithm and not accessed from our code
+    insertion_index: int  # Same as above
     acquisition_event: AssetAcquisitionEvent
 
 
 class BaseCostBasisMethod(metaclass=ABCMeta):
-    """The base class in which every other cost basis method inherits from."""
-    def __init__(self) -> None:
-        self._acquisitions_heap: list[AssetAcquisitionHeapElement] = []
+    """The base class in which every other cost basis method inherits from.
 
+    Each subclass keeps its acquisitions in the container that fits its consumption order.
+    """
     @abstractmethod
     def add_acquisition(self, acquisition: AssetAcquisitionEvent) -> None:
         """
@@ -148,12 +193,33 @@ class BaseCostBasisMethod(metaclass=ABCMeta):
         We can't return here Tuple of AssetAcquisitionEvents as we need to return
         the first event each time but _acquisitions may be not modified between iterations.
         """
-        while len(self._acquisitions_heap) > 0:
-            yield self._acquisitions_heap[0].acquisition_event
+        while len(self) > 0:
+            yield self._current_acquisition()
 
+    @abstractmethod
+    def _current_acquisition(self) -> AssetAcquisitionEvent:
+        """Returns the acquisition event that is consumed next
+
+        May raise:
+        - IndexError if there are no acquisitions
+        """
+        ...
+
+    @abstractmethod
+    def _remove_current_acquisition(self) -> None:
+        """Removes the acquisition event that is consumed next"""
+        ...
+
+    @abstractmethod
     def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
-        """Returns read-only _acquisitions"""
-        return tuple(entry.acquisition_event for entry in self._acquisitions_heap)
+        """Returns read-only _acquisitions in the order they are consumed"""
+        ...
+
+    @abstractmethod
+    def iter_acquisitions(self) -> Iterator[AssetAcquisitionEvent]:
+        """Iterates over the acquisitions in no particular order. Unlike get_acquisitions()
+        this does not copy or order them so it should be used when the order does not matter"""
+        ...
 
     def consume_result(self, used_amount: FVal) -> None:
         """
@@ -164,13 +230,14 @@ class BaseCostBasisMethod(metaclass=ABCMeta):
         May raise:
         - IndexError if the method was called when acquisitions were empty
         """
+        acquisition_event = self._current_acquisition()
         # this is a temporary assertion to test that new accounting tools work properly.
         # Written on 06.06.2022 and can be removed after a couple of months if everything goes well
-        assert ZERO <= used_amount <= self._acquisitions_heap[0].acquisition_event.remaining_amount, f'Used amount must be in the interval [0, {self._acquisitions_heap[0].acquisition_event.remaining_amount}] but it was {used_amount}'  # noqa: E501
+        assert ZERO <= used_amount <= acquisition_event.remaining_amount, f'Used amount must be in the interval [0, {acquisition_event.remaining_amount}] but it was {used_amount}'  # noqa: E501
 
-        self._acquisitions_heap[0].acquisition_event.remaining_amount -= used_amount
-        if self._acquisitions_heap[0].acquisition_event.remaining_amount == ZERO:
-            heapq.heappop(self._acquisitions_heap)
+        acquisition_event.remaining_amount -= used_amount
+        if acquisition_event.remaining_amount == ZERO:
+            self._remove_current_acquisition()
 
     def calculate_spend_cost_basis(
             self,
@@ -197,12 +264,16 @@ class BaseCostBasisMethod(metaclass=ABCMeta):
         remaining_sold_amount = spending_amount
         taxfree_bought_cost = taxable_bought_cost = taxable_amount = taxfree_amount = ZERO  # noqa: E501
         matched_acquisitions = []
+        # the date of each matched acquisition is only formatted if it is going to be logged
+        debug_enabled = log.isEnabledFor(logging.DEBUG)
+
+        # acquisitions before this timestamp are past the tax free period of this spend
+        taxfree_before_ts = None
+        if settings.taxfree_after_period is not None:
+            taxfree_before_ts = timestamp - settings.taxfree_after_period
 
         for acquisition_event in self.processing_iterator():
-            if settings.taxfree_after_period is None:
-                at_taxfree_period = False
-            else:
-                at_taxfree_period = acquisition_event.timestamp + settings.taxfree_after_period < timestamp  # noqa: E501
+            at_taxfree_period = taxfree_before_ts is not None and acquisition_event.timestamp < taxfree_before_ts  # noqa: E501
 
             if remaining_sold_amount < acquisition_event.remaining_amount:
                 acquisition_cost = acquisition_event.rate * remaining_sold_amount if average_cost_basis is None else average_cost_basis  # noqa: E501
@@ -216,16 +287,17 @@ class BaseCostBasisMethod(metaclass=ABCMeta):
                     taxable_amount += remaining_sold_amount
                     taxable_bought_cost += acquisition_cost
 
-                log.debug(
-                    'Spend uses up part of historical acquisition',
-                    tax_status='TAX-FREE' if at_taxfree_period else 'TAXABLE',
-                    used_amount=remaining_sold_amount,
-                    from_amount=acquisition_event.amount,
-                    asset=spending_asset,
-                    acquisition_rate=acquisition_event.rate,
-                    profit_currency=settings.main_currency,
-                    time=timestamp_to_date(acquisition_event.timestamp),
-                )
+                if debug_enabled:
+                    log.debug(
+                        'Spend uses up part of historical acquisition',
+                        tax_status='TAX-FREE' if at_taxfree_period else 'TAXABLE',
+                        used_amount=remaining_sold_amount,
+                        from_amount=acquisition_event.amount,
+                        asset=spending_asset,
+                        acquisition_rate=acquisition_event.rate,
+                        profit_currency=settings.main_currency,
+                        time=timestamp_to_date(acquisition_event.timestamp),
+                    )
                 matched_acquisitions.append(MatchedAcquisition(
                     amount=remaining_sold_amount,
                     event=acquisition_event,
@@ -247,15 +319,16 @@ class BaseCostBasisMethod(metaclass=ABCMeta):
                 taxable_amount += acquisition_event.remaining_amount
                 taxable_bought_cost += acquisition_cost
 
-            log.debug(
-                'Spend uses up entire historical acquisition',
-                tax_status='TAX-FREE' if at_taxfree_period else 'TAXABLE',
-                bought_amount=acquisition_event.remaining_amount,
-                asset=spending_asset,
-                acquisition_rate=acquisition_event.rate,
-                profit_currency=settings.main_currency,
-                time=timestamp_to_date(acquisition_event.timestamp),
-            )
+            if debug_enabled:
+                log.debug(
+                    'Spend uses up entire historical acquisition',
+                    tax_status='TAX-FREE' if at_taxfree_period else 'TAXABLE',
+                    bought_amount=acquisition_event.remaining_amount,
+                    asset=spending_asset,
+                    acquisition_rate=acquisition_event.rate,
+                    profit_currency=settings.main_currency,
+                    time=timestamp_to_date(acquisition_event.timestamp),
+                )
             matched_acquisitions.append(MatchedAcquisition(
                 amount=acquisition_event.remaining_amount,
                 event=acquisition_event,
@@ -290,38 +363,73 @@ class BaseCostBasisMethod(metaclass=ABCMeta):
             is_complete=is_complete,
         )
 
+    @abstractmethod
     def __len__(self) -> int:
-        return len(self._acquisitions_heap)
+        ...
 
 
 class FIFOCostBasisMethod(BaseCostBasisMethod):
     """
     Accounting in FIFO (first-in-first-out) method.
     https://www.investopedia.com/terms/f/fifo.asp
+
+    Acquisitions are consumed in the order they were added so they are kept in a
+    deque instead of the heap. Adding and consuming an acquisition is then O(1).
     """
     def __init__(self) -> None:
-        super().__init__()
-        self._count = ZERO
+        self._acquisitions: deque[AssetAcquisitionEvent] = deque()
 
     def add_acquisition(self, acquisition: AssetAcquisitionEvent) -> None:
-        """Adds an acquisition to the `_acquisitions_heap` using a counter to achieve the FIFO order."""  # noqa: E501
-        heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(self._count, acquisition))  # noqa: E501
-        self._count += 1
+        """Adds an acquisition to the end of `_acquisitions` to achieve the FIFO order."""
+        self._acquisitions.append(acquisition)
+
+    def _current_acquisition(self) -> AssetAcquisitionEvent:
+        return self._acquisitions[0]
+
+    def _remove_current_acquisition(self) -> None:
+        self._acquisitions.popleft()
+
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        """Returns read-only _acquisitions"""
+        return tuple(self._acquisitions)
+
+    def iter_acquisitions(self) -> Iterator[AssetAcquisitionEvent]:
+        return iter(self._acquisitions)
+
+    def __len__(self) -> int:
+        return len(self._acquisitions)
 
 
 class LIFOCostBasisMethod(BaseCostBasisMethod):
     """
     Accounting in LIFO (last-in-first-out) method.
     https://www.investopedia.com/terms/l/lifo.asp
+
+    The acquisition added last is always consumed first so they are kept in a list used
+    as a stack instead of the heap. Adding and consuming an acquisition is then O(1).
     """
     def __init__(self) -> None:
-        super().__init__()
-        self._count = ZERO
+        self._acquisitions: list[AssetAcquisitionEvent] = []
 
     def add_acquisition(self, acquisition: AssetAcquisitionEvent) -> None:
-        """Adds an acquisition to the `_acquisitions_heap` using a negated counter to achieve the LIFO order."""  # noqa: E501
-        heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-self._count, acquisition))  # noqa: E501
-        self._count += 1
+        """Adds an acquisition to the top of the `_acquisitions` stack to achieve the LIFO order."""  # noqa: E501
+        self._acquisitions.append(acquisition)
+
+    def _current_acquisition(self) -> AssetAcquisitionEvent:
+        return self._acquisitions[-1]
+
+    def _remove_current_acquisition(self) -> None:
+        self._acquisitions.pop()
+
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        """Returns read-only _acquisitions in the order they are consumed"""
+        return tuple(reversed(self._acquisitions))
+
+    def iter_acquisitions(self) -> Iterator[AssetAcquisitionEvent]:
+        return iter(self._acquisitions)
+
+    def __len__(self) -> int:
+        return len(self._acquisitions)
 
 
 class HIFOCostBasisMethod(BaseCostBasisMethod):
@@ -329,22 +437,45 @@ class HIFOCostBasisMethod(BaseCostBasisMethod):
     Accounting in HIFO (highest-in-first-out) method.
     https://www.investopedia.com/terms/h/hifo.asp
     """
+    def __init__(self) -> None:
+        self._acquisitions_heap: list[AssetAcquisitionHeapElement] = []
+        self._insertion_index = 0
+
     def add_acquisition(self, acquisition: AssetAcquisitionEvent) -> None:
         """
         Adds an acquisition to the `_acquisitions_heap` using the negated amount
         of the acquisition to achieve the HIFO order.
         """
-        heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-acquisition.amount, acquisition))  # noqa: E501
+        heapq.heappush(
+            self._acquisitions_heap,
+            AssetAcquisitionHeapElement(-acquisition.amount, self._insertion_index, acquisition),
+        )
+        self._insertion_index += 1
+
+    def _current_acquisition(self) -> AssetAcquisitionEvent:
+        return self._acquisitions_heap[0].acquisition_event
 
+    def _remove_current_acquisition(self) -> None:
+        heapq.heappop(self._acquisitions_heap)
 
-class AverageCostBasisMethod(BaseCostBasisMethod):
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        """Returns read-only _acquisitions in the order they are consumed"""
+        return tuple(entry.acquisition_event for entry in sorted(self._acquisitions_heap))
+
+    def iter_acquisitions(self) -> Iterator[AssetAcquisitionEvent]:
+        return (entry.acquisition_event for entry in self._acquisitions_heap)
+
+    def __len__(self) -> int:
+        return len(self._acquisitions_heap)
+
+
+class AverageCostBasisMethod(FIFOCostBasisMethod):
     """
     Accounting in Average Cost Basis(ACB) method.
     https://www.investopedia.com/terms/a/averagecostbasismethod.asp
     """
     def __init__(self) -> None:
         super().__init__()
-        self._count = ZERO
         # keeps track of the amount of the asset remaining after every acquisition or spend
         self.remaining_amount = ZERO
         # the average cost basis of last event(buy/sell) that occurred
@@ -352,7 +483,7 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
 
     def add_acquisition(self, acquisition: AssetAcquisitionEvent) -> None:
         """
-        Adds an acquisition to the `_acquisitions_heap` in order of time seen.
+        Adds an acquisition to `_acquisitions` in order of time seen.
 
         It also calculates the average cost basis of that acquisition with respect to the
         previous average cost basis.
@@ -360,13 +491,9 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
         The formula used to calculate the average cost basis of an acquisition is:
         [Previous Total ACB] + [Cost of New Shares] + [Transaction Costs]
         """
-        heapq.heappush(
-            self._acquisitions_heap,
-            AssetAcquisitionHeapElement(self._count, acquisition),
-        )
+        super().add_acquisition(acquisition)
         self.current_average_cost_basis += (acquisition.rate * acquisition.amount)
         self.remaining_amount += acquisition.amount
-        self._count += 1
 
     def consume_result(self, used_amount: FVal) -> None:
         """Same as its parent function but also deducts `used_amount` from `remaining_amount`."""
@@ -563,16 +690,14 @@ class CostBasisCalculator(CustomizableDateMixin):
     def reset(self, settings: DBSettings) -> None:
         self.settings = settings
         self.profit_currency = settings.main_currency
-        self._events: DefaultDict[Asset, CostBasisEvents] = defaultdict(lambda: CostBasisEvents(settings.cost_basis_method))  # noqa: E501
+        # keyed by identifier so that lookups hash and compare plain strings
+        self._events: DefaultDict[str, CostBasisEvents] = defaultdict(lambda: CostBasisEvents(settings.cost_basis_method))  # noqa: E501
         self.missing_acquisitions: list[MissingAcquisition] = []
         self.missing_prices: set[MissingPrice] = set()
 
     def get_events(self, asset: Asset) -> CostBasisEvents:
         """Custom getter for events so that we have common cost basis for some assets"""
-        if asset == A_WETH:
-            asset = A_ETH
-
-        return self._events[asset]
+        return self._events[_cost_basis_identifier(asset)]
 
     def reduce_asset_amount(self, asset: Asset, amount: FVal, timestamp: Timestamp) -> bool:
         """Searches all acquisition events for asset and reduces them by amount.
@@ -583,8 +708,10 @@ class CostBasisCalculator(CustomizableDateMixin):
         This function does the same as calculate_spend_cost_basis as far as consuming
         acquisitions is concerned but does not calculate bought cost.
         """
-        asset_events = self.get_events(asset)
-        if len(asset_events.acquisitions_manager) == 0:
+        # don't create events for assets that were never acquired. Happens for example
+        # for most of the prefork assets that are reduced whenever ETH or BTC is spent
+        asset_events = self._events.get(_cost_basis_identifier(asset))
+        if asset_events is None or len(asset_events.acquisitions_manager) == 0:
             return False
 
         remaining_amount = amount
@@ -703,6 +830,6 @@ class CostBasisCalculator(CustomizableDateMixin):
         asset_events = self.get_events(asset)
 
         amount = ZERO
-        for acquisition_event in asset_events.acquisitions_manager.get_acquisitions():
+        for acquisition_event in asset_events.acquisitions_manager.iter_acquisitions():
             amount += acquisition_event.remaining_amount
         return amount if amount != ZERO else None
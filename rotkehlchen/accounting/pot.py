@@ -1,6 +1,7 @@
 import logging
 from typing import TYPE_CHECKING, Any, Literal, Optional
 
+from rotkehlchen.accounting.constants import PNL_EVENTS_DB_WRITE_BATCH_SIZE
 from rotkehlchen.accounting.cost_basis import CostBasisCalculator
 from rotkehlchen.accounting.cost_basis.prefork import (
     handle_prefork_asset_acquisitions,
@@ -17,7 +18,6 @@ from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.errors.misc import InputError, RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
-from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -28,6 +28,7 @@ from rotkehlchen.utils.mixins.customizable_date import CustomizableDateMixin
 if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.accounting.aggregator import EVMAccountingAggregator
     from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -53,6 +54,8 @@ class AccountingPot(CustomizableDateMixin):
         )
         self.pnls = PnlTotals()
         self.processed_events: list[ProcessedAccountingEvent] = []
+        # processed events that have not yet been written to the DB report
+        self.unsaved_events: list[ProcessedAccountingEvent] = []
         self.transactions = TransactionsAccountant(
             evm_accounting_aggregator=evm_accounting_aggregator,
             pot=self,
@@ -61,20 +64,31 @@ class AccountingPot(CustomizableDateMixin):
         self.report_id: Optional[int] = None
 
     def _add_processed_event(self, event: ProcessedAccountingEvent) -> None:
-        dbpnl = DBAccountingReports(self.database)
         self.processed_events.append(event)
+        self.unsaved_events.append(event)
+        if len(self.unsaved_events) >= PNL_EVENTS_DB_WRITE_BATCH_SIZE:
+            with self.database.transient_write() as write_cursor:
+                self.save_processed_events(write_cursor)
+
+        log.debug(event.to_string(self.timestamp_to_date))
+
+    def save_processed_events(self, write_cursor: 'DBCursor') -> None:
+        """Writes all processed events not yet saved to the DB report in one batch"""
+        if len(self.unsaved_events) == 0:
+            return
+
+        dbpnl = DBAccountingReports(self.database)
         try:
-            dbpnl.add_report_data(
+            dbpnl.add_report_data_many(
+                write_cursor=write_cursor,
                 report_id=self.report_id,  # type: ignore # report id is initialized by now
-                time=event.timestamp,
                 ts_converter=self.timestamp_to_date,
-                event=event,
+                events=self.unsaved_events,
             )
-        except (DeserializationError, InputError) as e:
+        except InputError as e:
             log.error(str(e))
-            return
 
-        log.debug(event.to_string(self.timestamp_to_date))
+        self.unsaved_events = []
 
     def get_rate_in_profit_currency(self, asset: Asset, timestamp: Timestamp) -> Price:
         """Get the profit_currency price of asset in the given timestamp
@@ -112,6 +126,7 @@ class AccountingPot(CustomizableDateMixin):
         self.cost_basis.reset(settings)
         self.transactions.reset()
         self.processed_events = []
+        self.unsaved_events = []
 
     def add_acquisition(
             self,  # pylint: disable=unused-argument
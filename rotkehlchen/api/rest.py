@@ -4097,7 +4097,8 @@ class RestAPI():
     def purge_pnl_report_data(self, report_id: int) -> Response:
         dbreports = DBAccountingReports(self.rotkehlchen.data.db)
         try:
-            dbreports.purge_report_data(report_id=report_id)
+            with self.rotkehlchen.data.db.transient_write() as write_cursor:
+                dbreports.purge_report_data(write_cursor=write_cursor, report_id=report_id)
         except InputError as e:
             return api_response(wrap_in_fail_result(str(e)), status_code=HTTPStatus.BAD_REQUEST)
 
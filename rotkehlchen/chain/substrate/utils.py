@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import get_args
 
 from substrateinterface import Keypair
@@ -22,16 +23,31 @@ POLKADOT_NODES_TO_CONNECT_AT_START = (
 )
 
 SUBSTRATE_NODE_CONNECTION_TIMEOUT = 10
+# The same few user addresses get validated and derived repeatedly, so results are cached
+SUBSTRATE_ADDRESS_CACHE_SIZE = 4096
+SUBSTRATE_SS58_FORMATS: dict[SUPPORTED_SUBSTRATE_CHAINS, int] = {
+    SupportedBlockchain.KUSAMA: 2,
+    SupportedBlockchain.POLKADOT: 0,
+}
 
 
+@lru_cache(maxsize=SUBSTRATE_ADDRESS_CACHE_SIZE)
 def is_valid_kusama_address(value: str) -> bool:
-    return is_valid_ss58_address(value=value, valid_ss58_format=2)
+    return is_valid_ss58_address(
+        value=value,
+        valid_ss58_format=SUBSTRATE_SS58_FORMATS[SupportedBlockchain.KUSAMA],
+    )
 
 
+@lru_cache(maxsize=SUBSTRATE_ADDRESS_CACHE_SIZE)
 def is_valid_polkadot_address(value: str) -> bool:
-    return is_valid_ss58_address(value=value, valid_ss58_format=0)
+    return is_valid_ss58_address(
+        value=value,
+        valid_ss58_format=SUBSTRATE_SS58_FORMATS[SupportedBlockchain.POLKADOT],
+    )
 
 
+@lru_cache(maxsize=SUBSTRATE_ADDRESS_CACHE_SIZE)
 def get_substrate_address_from_public_key(
         chain: SUPPORTED_SUBSTRATE_CHAINS,
         public_key: SubstratePublicKey,
@@ -47,13 +63,8 @@ def get_substrate_address_from_public_key(
     a valid int.
     """
     assert chain in get_args(SUPPORTED_SUBSTRATE_CHAINS)
-    if chain == SupportedBlockchain.KUSAMA:
-        ss58_format = 2
-    else:  # polkadot
-        ss58_format = 0
-
     keypair = Keypair(
         public_key=public_key,
-        ss58_format=ss58_format,
+        ss58_format=SUBSTRATE_SS58_FORMATS[chain],
     )
     return SubstrateAddress(keypair.ss58_address)
@@ -1,6 +1,7 @@
 import logging
-from copy import deepcopy
-from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Union, overload
+from collections import defaultdict
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, DefaultDict, Literal, Optional, Union, overload
 
 from pysqlcipher3 import dbapi2 as sqlcipher
 
@@ -12,7 +13,7 @@ from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import Timestamp
-from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.misc import get_chunks, ts_now
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -23,6 +24,55 @@ if TYPE_CHECKING:
     from rotkehlchen.db.filtering import ReportDataFilterQuery
 
 
+# The statements used to write reports. Defined once so that the exact same
+# query strings are reused by the connection's prepared statement cache.
+INSERT_REPORT_QUERY = """
+INSERT INTO pnl_reports(
+    timestamp, start_ts, end_ts, first_processed_timestamp,
+    last_processed_timestamp, processed_actions, total_actions
+)
+VALUES (?, ?, ?, ?, ?, ?, ?)"""
+INSERT_REPORT_SETTINGS_QUERY = (
+    'INSERT OR IGNORE INTO pnl_report_settings(report_id, name, type, value) VALUES(?, ?, ?, ?)'
+)
+UPDATE_REPORT_OVERVIEW_QUERY = (
+    'UPDATE pnl_reports SET last_processed_timestamp=?, '
+    'processed_actions=?, total_actions=? WHERE identifier=?'
+)
+INSERT_REPORT_TOTALS_QUERY = (
+    'INSERT OR IGNORE INTO pnl_report_totals(report_id, name, taxable_value, free_value) '
+    'VALUES(?, ?, ?, ?)'
+)
+INSERT_PNL_EVENT_QUERY = 'INSERT INTO pnl_events(report_id, timestamp, data) VALUES(?, ?, ?)'
+# Events are written with multi-row inserts of this many rows per statement. Kept
+# so that the bindings (3 per row) stay under the default sqlite variables limit of 999
+PNL_EVENTS_INSERT_CHUNK_SIZE = 300
+INSERT_PNL_EVENTS_CHUNK_QUERY = (
+    'INSERT INTO pnl_events(report_id, timestamp, data) VALUES' +
+    ','.join(['(?, ?, ?)'] * PNL_EVENTS_INSERT_CHUNK_SIZE)
+)
+UPDATE_REPORT_SIZE_QUERY = (
+    'UPDATE pnl_reports SET size_on_disk = size_on_disk + ? WHERE identifier=?'
+)
+DELETE_REPORT_QUERY = 'DELETE FROM pnl_reports WHERE identifier=?'
+# The DB settings saved along with each PnL report as (name, type, getter) entries
+REPORT_SETTINGS: tuple[tuple[str, Literal['string', 'integer', 'bool'], Callable[[DBSettings], Any]], ...] = (  # noqa: E501
+    ('profit_currency', 'string', lambda x: x.main_currency.identifier),
+    ('taxfree_after_period', 'integer', lambda x: x.taxfree_after_period),
+    ('include_crypto2crypto', 'bool', lambda x: x.include_crypto2crypto),
+    ('calculate_past_cost_basis', 'bool', lambda x: x.calculate_past_cost_basis),
+    ('include_gas_costs', 'bool', lambda x: x.include_gas_costs),
+    ('account_for_assets_movements', 'bool', lambda x: x.account_for_assets_movements),
+    ('cost_basis_method', 'string', lambda x: x.cost_basis_method.serialize()),
+    ('eth_staking_taxable_after_withdrawal_enabled', 'bool', lambda x: x.eth_staking_taxable_after_withdrawal_enabled),  # noqa: E501
+)
+REPORT_SETTING_DESERIALIZERS: dict[str, Callable[[str], Any]] = {
+    'integer': int,
+    'bool': lambda x: x == '1',
+    'string': lambda x: x,
+}
+
+
 @overload
 def _get_reports_or_events_maybe_limit(
         entry_type: Literal['events'],
@@ -68,44 +118,30 @@ class DBAccountingReports():
 
     def add_report(
             self,
+            write_cursor: 'DBCursor',
             first_processed_timestamp: Timestamp,
             start_ts: Timestamp,
             end_ts: Timestamp,
             settings: DBSettings,
     ) -> int:
-        with self.db.transient_write() as cursor:
-            timestamp = ts_now()
-            query = """
-            INSERT INTO pnl_reports(
-                timestamp, start_ts, end_ts, first_processed_timestamp,
-                last_processed_timestamp, processed_actions, total_actions
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)"""
-            cursor.execute(
-                query,
-                (timestamp, start_ts, end_ts, first_processed_timestamp,
-                 0, 0, 0,  # will be set later
-                 ),
-            )
-            report_id = cursor.lastrowid
-            cursor.executemany(
-                'INSERT OR IGNORE INTO pnl_report_settings(report_id, name, type, value) '
-                'VALUES(?, ?, ?, ?)',
-                [
-                    (report_id, 'profit_currency', 'string', settings.main_currency.identifier),
-                    (report_id, 'taxfree_after_period', 'integer', settings.taxfree_after_period),
-                    (report_id, 'include_crypto2crypto', 'bool', settings.include_crypto2crypto),
-                    (report_id, 'calculate_past_cost_basis', 'bool', settings.calculate_past_cost_basis),  # noqa: E501
-                    (report_id, 'include_gas_costs', 'bool', settings.include_gas_costs),
-                    (report_id, 'account_for_assets_movements', 'bool', settings.account_for_assets_movements),  # noqa: E501
-                    (report_id, 'cost_basis_method', 'string', settings.cost_basis_method.serialize()),  # noqa: E501
-                    (report_id, 'eth_staking_taxable_after_withdrawal_enabled', 'bool', settings.eth_staking_taxable_after_withdrawal_enabled),  # noqa: E501
-                ])
+        timestamp = ts_now()
+        write_cursor.execute(
+            INSERT_REPORT_QUERY,
+            (timestamp, start_ts, end_ts, first_processed_timestamp,
+             0, 0, 0,  # will be set later
+             ),
+        )
+        report_id = write_cursor.lastrowid
+        write_cursor.executemany(
+            INSERT_REPORT_SETTINGS_QUERY,
+            [(report_id, name, type_, getter(settings)) for name, type_, getter in REPORT_SETTINGS],  # noqa: E501
+        )
 
         return report_id
 
     def add_report_overview(
             self,
+            write_cursor: 'DBCursor',
             report_id: int,
             last_processed_timestamp: Timestamp,
             processed_actions: int,
@@ -117,45 +153,20 @@ class DBAccountingReports():
         May raise:
         - InputError if the given report id does not exist
         """
-        with self.db.transient_write() as cursor:
-            cursor.execute(
-                'UPDATE pnl_reports SET last_processed_timestamp=?,'
-                ' processed_actions=?, total_actions=? WHERE identifier=?',
-                (last_processed_timestamp, processed_actions, total_actions, report_id),
-            )
-            if cursor.rowcount != 1:
-                raise InputError(
-                    f'Could not insert overview for {report_id}. '
-                    f'Report id could not be found in the DB',
-                )
-
-            tuples = []
-            for event_type, entry in pnls.items():
-                tuples.append((report_id, event_type.serialize(), str(entry.taxable), str(entry.free)))  # noqa: E501
-            cursor.executemany(
-                'INSERT OR IGNORE INTO pnl_report_totals(report_id, name, taxable_value, free_value) VALUES(?, ?, ?, ?)',  # noqa: E501
-                tuples,
+        write_cursor.execute(
+            UPDATE_REPORT_OVERVIEW_QUERY,
+            (last_processed_timestamp, processed_actions, total_actions, report_id),
+        )
+        if write_cursor.rowcount != 1:
+            raise InputError(
+                f'Could not insert overview for {report_id}. '
+                f'Report id could not be found in the DB',
             )
 
-    def _get_report_size(self, cursor: 'DBCursor', report_id: int) -> int:  # pylint: disable=no-self-use  # noqa: E501
-        """Returns an approximation of the DB size in bytes for the given report.
-
-        It's an approximation since length() in sqlite returns the string length
-        and not the byte length of a field. Also integers are stored depending on
-        their size and there is no easy way (apart from checking each integer) to
-        figure out the byte size. Finally there probably is various padding and
-        prefixes which are not taken into account.
-        """
-        result = cursor.execute(
-            """SELECT SUM(row_size) FROM (SELECT
-            8 + /*identifier - assume biggest int size */
-            8 + /*report_id  - assume biggest int size */
-            8 + /*timestamp  - assume biggest int size */
-            1 + /*event_type */
-            length(data) AS row_size FROM pnl_events WHERE report_id=?)""",
-            (report_id,),
-        ).fetchone()[0]
-        return 0 if result is None else result
+        write_cursor.executemany(
+            INSERT_REPORT_TOTALS_QUERY,
+            [(report_id, event_type.serialize(), str(entry.taxable), str(entry.free)) for event_type, entry in pnls.items()],  # noqa: E501
+        )
 
     def get_reports(
             self,
@@ -164,79 +175,130 @@ class DBAccountingReports():
     ) -> tuple[list[dict[str, Any]], int]:
         """Queries all historical saved PnL reports.
 
-        If `with_limit` is true then the api limit is applied
+        If `with_limit` is true then the api limit is applied. In that case only the
+        latest reports are queried from the DB and the found entries are counted separately.
+
+        The totals and settings of all reports are queried in bulk and grouped
+        per report id so that the number of queries does not grow with the reports.
         """
         bindings: Union[tuple, tuple[int]] = ()
         query = 'SELECT * from pnl_reports'
-        reports: list[dict[str, Any]] = []
+        report_filter = ''
+        limit_reports = report_id is None and with_limit is True
         if report_id is not None:
             bindings = (report_id,)
             query += ' WHERE identifier=?'
+            report_filter = ' WHERE report_id=?'
+        elif limit_reports:
+            bindings = (FREE_REPORTS_LOOKUP_LIMIT,)
+            report_filter = ' WHERE report_id IN (SELECT identifier FROM pnl_reports ORDER BY identifier DESC LIMIT ?)'  # noqa: E501
+
+        query += ' ORDER BY identifier DESC'
+        if limit_reports:
+            query += ' LIMIT ?'
 
         with self.db.conn_transient.read_ctx() as cursor:
-            cursor.execute(query, bindings)
-            for report in cursor:
-                this_report_id = report[0]
-                with self.db.conn_transient.read_ctx() as other_cursor:
-                    size_result = self._get_report_size(other_cursor, this_report_id)
-                    other_cursor.execute(
-                        'SELECT name, taxable_value, free_value FROM pnl_report_totals WHERE report_id=?',  # noqa: E501
-                        (this_report_id,),
-                    )
-                    overview = {x[0]: {'taxable': x[1], 'free': x[2]} for x in other_cursor}
-                    other_cursor.execute(
-                        'SELECT name, type, value FROM pnl_report_settings WHERE report_id=?',
-                        (this_report_id,),
-                    )
-                    settings = {}
-                    for x in other_cursor:
-                        if x[1] == 'integer':
-                            settings[x[0]] = int(x[2])
-                        elif x[1] == 'bool':
-                            settings[x[0]] = x[2] == '1'
-                        else:
-                            settings[x[0]] = x[2]
-                    reports.append({
-                        'identifier': this_report_id,
-                        'timestamp': report[1],
-                        'start_ts': report[2],
-                        'end_ts': report[3],
-                        'first_processed_timestamp': report[4],
-                        'size_on_disk': size_result,
-                        'last_processed_timestamp': report[5],
-                        'processed_actions': report[6],
-                        'total_actions': report[7],
-                        'overview': overview,
-                        'settings': settings,
-                    })
-
-            if report_id is not None:
-                results = cursor.execute('SELECT COUNT(*) FROM pnl_reports').fetchone()
-                total_filter_count = results[0]
+            report_rows = cursor.execute(query, bindings).fetchall()
+            if limit_reports:
+                entries_found = cursor.execute('SELECT COUNT(*) FROM pnl_reports').fetchone()[0]
             else:
-                total_filter_count = len(reports)
+                entries_found = len(report_rows)
+
+            overviews: DefaultDict[int, dict[str, dict[str, str]]] = defaultdict(dict)
+            cursor.execute(
+                'SELECT report_id, name, taxable_value, free_value FROM pnl_report_totals' + report_filter,  # noqa: E501
+                bindings,
+            )
+            for x in cursor:
+                overviews[x[0]][x[1]] = {'taxable': x[2], 'free': x[3]}
+
+            settings: DefaultDict[int, dict[str, Any]] = defaultdict(dict)
+            cursor.execute(
+                'SELECT report_id, name, type, value FROM pnl_report_settings' + report_filter,
+                bindings,
+            )
+            for x in cursor:
+                settings[x[0]][x[1]] = REPORT_SETTING_DESERIALIZERS[x[2]](x[3])
+
+            reports: list[dict[str, Any]] = []
+            for report in report_rows:
+                this_report_id = report[0]
+                reports.append({
+                    'identifier': this_report_id,
+                    'timestamp': report[1],
+                    'start_ts': report[2],
+                    'end_ts': report[3],
+                    'first_processed_timestamp': report[4],
+                    'size_on_disk': report[8],
+                    'last_processed_timestamp': report[5],
+                    'processed_actions': report[6],
+                    'total_actions': report[7],
+                    'overview': overviews[this_report_id],
+                    'settings': settings[this_report_id],
+                })
 
         return _get_reports_or_events_maybe_limit(
             entry_type='reports',
             entries=reports,
-            entries_found=total_filter_count,
+            entries_found=entries_found,
             with_limit=with_limit,
         )
 
-    def purge_report_data(self, report_id: int) -> None:
+    def purge_report_data(self, write_cursor: 'DBCursor', report_id: int) -> None:
         """Deletes all report data of the given report from the DB
 
         Raises InputError if the report did not exist in the DB.
         """
-        with self.db.transient_write() as cursor:
-            cursor.execute('DELETE FROM pnl_reports WHERE identifier=?', (report_id,))
-            if cursor.rowcount != 1:
-                raise InputError(
-                    f'Could not delete PnL report {report_id} from the DB. Report was not found',
-                )
+        write_cursor.execute(DELETE_REPORT_QUERY, (report_id,))
+        if write_cursor.rowcount != 1:
+            raise InputError(
+                f'Could not delete PnL report {report_id} from the DB. Report was not found',
+            )
+
+    def _write_report_data(  # pylint: disable=no-self-use
+            self,
+            write_cursor: 'DBCursor',
+            report_id: int,
+            rows: list[tuple[int, Timestamp, str]],
+    ) -> None:
+        """Writes the given (report_id, timestamp, data) rows to the pnl events table
+        and adds their size to the size on disk of the report.
+
+        The size is an approximation since the string length of the data is used
+        and not the byte length. Also integers are stored depending on their size
+        so the biggest int size is assumed. Finally there probably is various
+        padding and prefixes which are not taken into account.
+
+        Full chunks of rows are written with a single multi-row insert each and the
+        remaining rows with the single row insert.
+
+        May raise:
+        - InputError if the rows can not be written to the DB. Probably report id does not exist.
+        """
+        try:
+            for chunk in get_chunks(rows, n=PNL_EVENTS_INSERT_CHUNK_SIZE):
+                if len(chunk) == PNL_EVENTS_INSERT_CHUNK_SIZE:
+                    write_cursor.execute(
+                        INSERT_PNL_EVENTS_CHUNK_QUERY,
+                        tuple(chain.from_iterable(chunk)),
+                    )
+                else:
+                    write_cursor.executemany(INSERT_PNL_EVENT_QUERY, chunk)
+        except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
+            raise InputError(
+                f'Could not write {len(rows)} events to the DB due to {str(e)}. '
+                f'Probably report {report_id} does not exist?',
+            ) from e
+
+        write_cursor.execute(
+            UPDATE_REPORT_SIZE_QUERY,
+            # identifier, report_id and timestamp as biggest ints, 1 byte event type + data
+            (sum(8 + 8 + 8 + 1 + len(x[2]) for x in rows), report_id),
+        )
 
     def add_report_data(
             self,
+            write_cursor: 'DBCursor',
             report_id: int,
             time: Timestamp,
             ts_converter: Callable[[Timestamp], str],
@@ -248,19 +310,39 @@ class DBAccountingReports():
         - InputError if the event can not be written to the DB. Probably report id does not exist.
         """
         data = event.serialize_for_db(ts_converter)
-        query = """
-        INSERT INTO pnl_events(
-            report_id, timestamp, data
+        self._write_report_data(
+            write_cursor=write_cursor,
+            report_id=report_id,
+            rows=[(report_id, time, data)],
         )
-        VALUES(?, ?, ?);"""
-        with self.db.transient_write() as cursor:
+
+    def add_report_data_many(
+            self,
+            write_cursor: 'DBCursor',
+            report_id: int,
+            ts_converter: Callable[[Timestamp], str],
+            events: list[ProcessedAccountingEvent],
+    ) -> None:
+        """Adds multiple entries to a transient report
+
+        The events are written with multi-row inserts of PNL_EVENTS_INSERT_CHUNK_SIZE
+        rows each and any leftover rows with a single executemany. The chunk size is
+        capped so that a statement's bindings stay under sqlite's limit of 999 variables.
+
+        Events that fail to serialize are logged and skipped.
+
+        May raise:
+        - InputError if the events can not be written to the DB. Probably report id does not exist.
+        """
+        rows = []
+        for event in events:
             try:
-                cursor.execute(query, (report_id, time, data))
-            except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
-                raise InputError(
-                    f'Could not write {event} data to the DB due to {str(e)}. '
-                    f'Probably report {report_id} does not exist?',
-                ) from e
+                rows.append((report_id, event.timestamp, event.serialize_for_db(ts_converter)))
+            except DeserializationError as e:
+                log.error(f'Could not serialize {event} for the DB due to {str(e)}. Skipping it')
+
+        if len(rows) != 0:
+            self._write_report_data(write_cursor=write_cursor, report_id=report_id, rows=rows)
 
     def get_report_data(
             self,
@@ -269,46 +351,57 @@ class DBAccountingReports():
     ) -> tuple[list[ProcessedAccountingEvent], int]:
         """Retrieve the event data of a PnL report depending on the given filter
 
+        If `with_limit` is true then the rows stop being deserialized once the api
+        limit of events has been reached.
+
         May raise:
         - InputError if the report ID does not exist in the DB
         """
-        cursor = self.db.conn_transient.cursor()
-        report_id = filter_.report_id
-        query_result = cursor.execute(
-            'SELECT COUNT(*) FROM pnl_reports WHERE identifier=?',
-            (report_id,),
-        )
-        if query_result.fetchone()[0] != 1:
-            raise InputError(
-                f'Tried to get PnL events from non existing report with id {report_id}',
+        limit = FREE_PNL_EVENTS_LIMIT if with_limit is True else None
+        with self.db.conn_transient.read_ctx() as cursor:
+            report_id = filter_.report_id
+            query_result = cursor.execute(
+                'SELECT COUNT(*) FROM pnl_reports WHERE identifier=?',
+                (report_id,),
             )
+            if query_result.fetchone()[0] != 1:
+                raise InputError(
+                    f'Tried to get PnL events from non existing report with id {report_id}',
+                )
 
-        query, bindings = filter_.prepare()
-        query = 'SELECT timestamp, data FROM pnl_events ' + query
-        cursor.execute(query, bindings)
+            query, bindings = filter_.prepare()
+            # the window function counts all filtered rows before pagination is applied
+            query = 'SELECT timestamp, data, COUNT(*) OVER () FROM pnl_events ' + query
+            cursor.execute(query, bindings)
 
-        records = []
-        for result in cursor:
-            try:
-                record = ProcessedAccountingEvent.deserialize_from_db(result[0], result[1])
-            except DeserializationError as e:
-                self.db.msg_aggregator.add_error(
-                    f'Error deserializing AccountingEvent from the DB. Skipping it.'
-                    f'Error was: {str(e)}',
-                )
-                continue
-
-            records.append(record)
-
-        if filter_.pagination is not None:
-            no_pagination_filter = deepcopy(filter_)
-            no_pagination_filter.pagination = None
-            query, bindings = no_pagination_filter.prepare()
-            query = 'SELECT COUNT(*) FROM pnl_events ' + query
-            results = cursor.execute(query, bindings).fetchone()
-            total_filter_count = results[0]
-        else:
-            total_filter_count = len(records)
+            records = []
+            filtered_count = None
+            deserialize = ProcessedAccountingEvent.deserialize_from_db
+            for timestamp, data, count in cursor:
+                filtered_count = count
+                try:
+                    record = deserialize(timestamp, data)
+                except DeserializationError as e:
+                    self.db.msg_aggregator.add_error(
+                        f'Error deserializing AccountingEvent from the DB. Skipping it.'
+                        f'Error was: {str(e)}',
+                    )
+                    continue
+
+                records.append(record)
+                if len(records) == limit:
+                    break  # the rest would be cut by the limit so don't deserialize them
+
+            if filter_.pagination is not None:
+                if filtered_count is None:  # page was empty so count without pagination
+                    query, bindings = filter_.prepare(with_pagination=False, with_order=False)
+                    query = 'SELECT COUNT(*) FROM pnl_events ' + query
+                    filtered_count = cursor.execute(query, bindings).fetchone()[0]
+                total_filter_count = filtered_count
+            elif len(records) == limit:  # not all rows were read so use the window count
+                total_filter_count = filtered_count
+            else:
+                total_filter_count = len(records)
 
         return _get_reports_or_events_maybe_limit(
             entry_type='events',
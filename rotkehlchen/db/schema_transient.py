@@ -10,7 +10,8 @@ CREATE TABLE IF NOT EXISTS pnl_reports (
     first_processed_timestamp INTEGER,
     last_processed_timestamp INTEGER NOT NULL,
     processed_actions INTEGER NOT NULL,
-    total_actions INTEGER NOT NULL
+    total_actions INTEGER NOT NULL,
+    size_on_disk INTEGER NOT NULL DEFAULT 0
 );
 """
 
@@ -6,6 +6,7 @@ from rotkehlchen.errors.serialization import ConversionError
 # Here even though we got __future__ annotations using FVal does not seem to work
 AcceptableFValInitInput = Union[float, bytes, Decimal, int, str, 'FVal']
 AcceptableFValOtherInput = Union[int, 'FVal']
+DECIMAL_ZERO = Decimal(0)
 
 
 class FVal():
@@ -23,7 +24,10 @@ class FVal():
     def __init__(self, data: AcceptableFValInitInput = 0):
 
         try:
-            if isinstance(data, float):
+            # Decimal is what the arithmetic operations pass so it is checked first
+            if isinstance(data, Decimal):
+                self.num = data
+            elif isinstance(data, float):
                 self.num = Decimal(str(data))
             elif isinstance(data, bytes):
                 # assume it's an ascii string and try to decode the bytes to one
@@ -32,7 +36,7 @@ class FVal():
                 # This elif has to come before the isinstance(int) check due to
                 # https://stackoverflow.com/questions/37888620/comparing-boolean-and-int-using-isinstance
                 raise ValueError('Invalid type bool for data given to FVal constructor')
-            elif isinstance(data, (Decimal, int, str)):
+            elif isinstance(data, (int, str)):
                 self.num = Decimal(data)
             elif isinstance(data, FVal):
                 self.num = data.num
@@ -51,21 +55,23 @@ class FVal():
     def __repr__(self) -> str:
         return 'FVal({})'.format(str(self.num))
 
+    # Ordering comparisons of Decimals already signal InvalidOperation for NaNs
+    # just like compare_signal does so the native operators are used
     def __gt__(self, other: AcceptableFValOtherInput) -> bool:
         evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) == Decimal('1')
+        return self.num > evaluated_other
 
     def __lt__(self, other: AcceptableFValOtherInput) -> bool:
         evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) == Decimal('-1')
+        return self.num < evaluated_other
 
     def __le__(self, other: AcceptableFValOtherInput) -> bool:
         evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) in (Decimal('-1'), Decimal('0'))
+        return self.num <= evaluated_other
 
     def __ge__(self, other: AcceptableFValOtherInput) -> bool:
         evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) in (Decimal('1'), Decimal('0'))
+        return self.num >= evaluated_other
 
     def __eq__(self, other: object) -> bool:
         evaluated_other: Union[Decimal, int]
@@ -76,7 +82,7 @@ class FVal():
         else:
             evaluated_other = other
 
-        return self.num.compare_signal(evaluated_other) == Decimal('0')
+        return self.num.compare_signal(evaluated_other) == DECIMAL_ZERO
 
     def __add__(self, other: AcceptableFValOtherInput) -> 'FVal':
         evaluated_other = _evaluate_input(other)
@@ -168,13 +174,11 @@ class FVal():
         return int(self.num)
 
     def is_close(self, other: AcceptableFValInitInput, max_diff: str = "1e-6") -> bool:
-        evaluated_max_diff = FVal(max_diff)
-
         if not isinstance(other, FVal):
             other = FVal(other)
 
         diff_num = abs(self.num - other.num)
-        return diff_num <= evaluated_max_diff.num
+        return diff_num <= Decimal(max_diff)
 
 
 def _evaluate_input(other: Any) -> Union[Decimal, int]:
@@ -1,11 +1,7 @@
-import datetime
 import os
-import re
 import sys
-import tempfile
 import warnings as test_warnings
 from enum import auto
-from pathlib import Path
 
 import py
 import pytest
@@ -22,8 +18,6 @@ class TestEnvironment(SerializableEnumMixin):
     NFTS = auto()  # nft tests
 
 
-add_logging_level('TRACE', TRACE)
-configure_logging(default_args())
 # sql instructions for global DB are customizable here:
 # https://github.com/rotki/rotki/blob/eb5bef269207e8b84075ee36ce7c3804115ed6a0/rotkehlchen/tests/fixtures/globaldb.py#L33
 
@@ -48,6 +42,14 @@ def pytest_addoption(parser):
     parser.addoption('--profiler', default=None, choices=['flamegraph-trace'])
 
 
+def pytest_configure(config):
+    """Set up logging once the run starts instead of at import time of the conftest.
+    There is nothing to log when only collecting tests so logging is not configured then."""
+    add_logging_level('TRACE', TRACE)
+    if config.option.collectonly is False:
+        configure_logging(default_args())
+
+
 if sys.platform == 'darwin':
     # On macOS the temp directory base path is already very long.
     # To avoid failures on ipc tests (ipc path length is limited to 104/108 chars on macOS/linux)
@@ -94,11 +96,9 @@ if sys.platform == 'darwin':
         directory.  The returned object is a `py.path.local`_
         path object.
         """
-        name = request.node.name
-        name = re.sub(r'[\W]', '_', name)
-        max_val = 1
-        if len(name) > max_val:
-            name = name[:max_val]
+        first_char = request.node.name[0]
+        # only the first character of the test name is kept, with non word characters replaced
+        name = first_char if first_char.isalnum() else '_'
         return tmpdir_factory.mktemp(name, numbered=True)
 
 
@@ -107,6 +107,10 @@ def profiler(request):
     profiler_instance = None
 
     if request.config.option.profiler == 'flamegraph-trace':
+        import datetime  # pylint: disable=import-outside-toplevel
+        import tempfile  # pylint: disable=import-outside-toplevel
+        from pathlib import Path as _Path  # pylint: disable=import-outside-toplevel
+
         from tools.profiling.sampler import (  # pylint: disable=import-outside-toplevel  # noqa: E501
             FlameGraphCollector,
             TraceSampler,
@@ -114,7 +118,7 @@ def profiler(request):
 
         now = datetime.datetime.now()
         tmpdirname = tempfile.gettempdir()
-        stack_path = Path(tmpdirname) / f'{now:%Y%m%d_%H%M}_stack.data'
+        stack_path = _Path(tmpdirname) / f'{now:%Y%m%d_%H%M}_stack.data'
         test_warnings.warn(UserWarning(
             f'Stack data is saved at: {stack_path}',
         ))
@@ -1,7 +1,16 @@
-from rotkehlchen.accounting.pnl import PnlTotals
-from rotkehlchen.db.reports import DBAccountingReports
+from unittest.mock import patch
+
+from rotkehlchen.accounting.mixins.event import AccountingEventType
+from rotkehlchen.accounting.pnl import PNL, PnlTotals
+from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
+from rotkehlchen.constants.assets import A_ETH
+from rotkehlchen.constants.misc import ONE, ZERO
+from rotkehlchen.db.filtering import ReportDataFilterQuery
+from rotkehlchen.db.reports import PNL_EVENTS_INSERT_CHUNK_SIZE, DBAccountingReports
 from rotkehlchen.db.settings import DBSettings
+from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.constants import A_GBP
+from rotkehlchen.types import CostBasisMethod, Location, Price, Timestamp
 
 
 def test_report_settings(database):
@@ -20,21 +29,24 @@ def test_report_settings(database):
     first_processed_timestamp = 4
     last_processed_timestamp = 9
     end_ts = 10
-    report_id = dbreport.add_report(
-        first_processed_timestamp=first_processed_timestamp,
-        start_ts=start_ts,
-        end_ts=end_ts,
-        settings=settings,
-    )
     total_actions = 10
     processed_actions = 2
-    dbreport.add_report_overview(
-        report_id=report_id,
-        last_processed_timestamp=last_processed_timestamp,
-        processed_actions=processed_actions,
-        total_actions=total_actions,
-        pnls=PnlTotals(),
-    )
+    with database.transient_write() as write_cursor:
+        report_id = dbreport.add_report(
+            write_cursor=write_cursor,
+            first_processed_timestamp=first_processed_timestamp,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            settings=settings,
+        )
+        dbreport.add_report_overview(
+            write_cursor=write_cursor,
+            report_id=report_id,
+            last_processed_timestamp=last_processed_timestamp,
+            processed_actions=processed_actions,
+            total_actions=total_actions,
+            pnls=PnlTotals(),
+        )
     data, entries_num = dbreport.get_reports(report_id=report_id, with_limit=False)
     assert len(data) == 1
     assert entries_num == 1
@@ -55,3 +67,166 @@ def test_report_settings(database):
         else:
             value = getattr(settings, setting_name)
         assert returned_settings[x] == value
+
+
+def _add_reports(database, settings_list):
+    """Add a report with an overview for each of the given settings and return their ids
+
+    The processed actions and the taxable trade pnl of each report are set to its index.
+    """
+    dbreport = DBAccountingReports(database)
+    report_ids = []
+    for idx, settings in enumerate(settings_list):
+        with database.transient_write() as write_cursor:
+            report_id = dbreport.add_report(
+                write_cursor=write_cursor,
+                first_processed_timestamp=1,
+                start_ts=1,
+                end_ts=10,
+                settings=settings,
+            )
+            dbreport.add_report_overview(
+                write_cursor=write_cursor,
+                report_id=report_id,
+                last_processed_timestamp=9,
+                processed_actions=idx,
+                total_actions=10,
+                pnls=PnlTotals({AccountingEventType.TRADE: PNL(taxable=FVal(idx), free=FVal(10))}),
+            )
+        report_ids.append(report_id)
+
+    return report_ids
+
+
+def test_get_reports_multiple(database):
+    """Test that querying all reports matches each report with its own totals and settings"""
+    dbreport = DBAccountingReports(database)
+    report_ids = _add_reports(
+        database=database,
+        settings_list=[DBSettings(cost_basis_method=x) for x in (CostBasisMethod.FIFO, CostBasisMethod.LIFO)],  # noqa: E501
+    )
+
+    data, entries_num = dbreport.get_reports(report_id=None, with_limit=False)
+    assert entries_num == 2
+    assert [x['identifier'] for x in data] == report_ids[::-1]  # latest report first
+    for idx, (report, cost_basis_method) in enumerate(zip(data[::-1], ('fifo', 'lifo'))):
+        assert report['processed_actions'] == idx
+        assert report['size_on_disk'] == 0
+        assert report['settings']['cost_basis_method'] == cost_basis_method
+        assert report['overview'] == {
+            AccountingEventType.TRADE.serialize(): {'taxable': str(idx), 'free': '10'},
+        }
+
+    # check that querying a single report only counts the matching report
+    data, entries_num = dbreport.get_reports(report_id=report_ids[1], with_limit=False)
+    assert entries_num == 1
+    assert len(data) == 1 and data[0]['identifier'] == report_ids[1]
+
+
+def test_get_reports_with_limit(database):
+    """Test that with the free limit only the latest reports are returned but all are counted"""
+    dbreport = DBAccountingReports(database)
+    report_ids = _add_reports(database=database, settings_list=[DBSettings()] * 3)
+
+    with patch('rotkehlchen.db.reports.FREE_REPORTS_LOOKUP_LIMIT', 2):
+        data, entries_num = dbreport.get_reports(report_id=None, with_limit=True)
+    assert entries_num == 3
+    assert [x['identifier'] for x in data] == report_ids[:0:-1]
+    for report, idx in zip(data, (2, 1)):
+        assert report['processed_actions'] == idx
+        assert report['settings']['cost_basis_method'] == 'fifo'
+        assert report['overview'] == {
+            AccountingEventType.TRADE.serialize(): {'taxable': str(idx), 'free': '10'},
+        }
+
+
+def _make_processed_events(count):
+    """Make count trade events with increasing index and timestamp"""
+    return [ProcessedAccountingEvent(
+        type=AccountingEventType.TRADE,
+        notes=f'event {idx}',
+        location=Location.EXTERNAL,
+        timestamp=Timestamp(idx + 1),
+        asset=A_ETH,
+        free_amount=ZERO,
+        taxable_amount=ONE,
+        price=Price(ONE),
+        pnl=PNL(),
+        cost_basis=None,
+        index=idx,
+    ) for idx in range(count)]
+
+
+def test_add_report_data_many(database):
+    """Test that a report and its events written in a single transaction can be read back"""
+    dbreport = DBAccountingReports(database)
+    events = _make_processed_events(5)
+    with database.transient_write() as write_cursor:
+        report_id = dbreport.add_report(
+            write_cursor=write_cursor,
+            first_processed_timestamp=1,
+            start_ts=1,
+            end_ts=10,
+            settings=DBSettings(),
+        )
+        dbreport.add_report_data_many(
+            write_cursor=write_cursor,
+            report_id=report_id,
+            ts_converter=str,
+            events=events,
+        )
+
+    data, entries_found = dbreport.get_report_data(
+        filter_=ReportDataFilterQuery.make(report_id=report_id),
+        with_limit=False,
+    )
+    assert entries_found == 5
+    assert [(x.index, x.timestamp, x.notes) for x in data] == [
+        (x.index, x.timestamp, x.notes) for x in events
+    ]
+    reports, _ = dbreport.get_reports(report_id=report_id, with_limit=False)
+    assert reports[0]['size_on_disk'] == sum(25 + len(x.serialize_for_db(str)) for x in events)
+
+    # check that with pagination the found entries are all those matching the filter
+    for offset, expected_indices in ((1, [1, 2]), (4, [4]), (10, [])):
+        data, entries_found = dbreport.get_report_data(
+            filter_=ReportDataFilterQuery.make(report_id=report_id, limit=2, offset=offset),
+            with_limit=False,
+        )
+        assert entries_found == 5
+        assert [x.index for x in data] == expected_indices
+
+    # check that with the free limit only the limit of events is returned but all are counted
+    with patch('rotkehlchen.db.reports.FREE_PNL_EVENTS_LIMIT', 2):
+        data, entries_found = dbreport.get_report_data(
+            filter_=ReportDataFilterQuery.make(report_id=report_id),
+            with_limit=True,
+        )
+    assert entries_found == 5
+    assert [x.index for x in data] == [0, 1]
+
+
+def test_add_report_data_many_in_chunks(database):
+    """Test that events spanning multiple insert chunks and a remainder are all written"""
+    dbreport = DBAccountingReports(database)
+    events_num = PNL_EVENTS_INSERT_CHUNK_SIZE * 2 + 1
+    with database.transient_write() as write_cursor:
+        report_id = dbreport.add_report(
+            write_cursor=write_cursor,
+            first_processed_timestamp=1,
+            start_ts=1,
+            end_ts=10,
+            settings=DBSettings(),
+        )
+        dbreport.add_report_data_many(
+            write_cursor=write_cursor,
+            report_id=report_id,
+            ts_converter=str,
+            events=_make_processed_events(events_num),
+        )
+    data, entries_found = dbreport.get_report_data(
+        filter_=ReportDataFilterQuery.make(report_id=report_id),
+        with_limit=False,
+    )
+    assert entries_found == events_num
+    assert [x.index for x in data] == list(range(events_num))
@@ -173,7 +173,7 @@ def test_fees_in_received_asset(accountant, google_service):
         history_list=history,
     )
     no_message_errors(accountant.msg_aggregator)
-    assert accountant.pots[0].cost_basis.get_calculated_asset_amount(A_USDT.identifier).is_close('19.90')  # noqa: E501
+    assert accountant.pots[0].cost_basis.get_calculated_asset_amount(A_USDT).is_close('19.90')  # noqa: E501
     expected_pnls = PnlTotals({
         AccountingEventType.TRADE: PNL(taxable=ZERO, free=FVal('14.2277')),
         AccountingEventType.FEE: PNL(taxable=FVal('-0.060271'), free=ZERO),
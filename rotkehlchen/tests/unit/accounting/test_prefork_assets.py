@@ -64,8 +64,8 @@ def test_buying_selling_eth_before_daofork(accountant, google_service):
     accounting_history_process(accountant, 1436979735, 1495751688, history3)
     no_message_errors(accountant.msg_aggregator)
     # make sure that the intermediate ETH sell before the fork reduced our ETC
-    assert accountant.pots[0].cost_basis.get_calculated_asset_amount('ETC') == FVal(850)
-    assert accountant.pots[0].cost_basis.get_calculated_asset_amount('ETH') == FVal(1390)
+    assert accountant.pots[0].cost_basis.get_calculated_asset_amount(A_ETC) == FVal(850)
+    assert accountant.pots[0].cost_basis.get_calculated_asset_amount(A_ETH) == FVal(1390)
 
     expected_pnls = PnlTotals({
         AccountingEventType.TRADE: PNL(taxable=FVal('382.4205350'), free=FVal('923.8099920')),
@@ -285,7 +285,7 @@ def test_margin_events_affect_gained_lost_amount(accountant, google_service):
         history_list=history,
     )
     no_message_errors(accountant.msg_aggregator)
-    assert accountant.pots[0].cost_basis.get_calculated_asset_amount('BTC').is_close('3.7468')
+    assert accountant.pots[0].cost_basis.get_calculated_asset_amount(A_BTC).is_close('3.7468')
     expected_pnls = PnlTotals({
         AccountingEventType.TRADE: PNL(taxable=FVal('1940.9761588'), free=ZERO),
         AccountingEventType.FEE: PNL(taxable=FVal('-1.87166029184'), free=ZERO),
@@ -9,12 +9,12 @@ from rotkehlchen.accounting.structures.types import HistoryEventSubType, History
 from rotkehlchen.accounting.types import MissingAcquisition
 from rotkehlchen.chain.ethereum.accounting.structures import TxEventSettings, TxMultitakeTreatment
 from rotkehlchen.chain.ethereum.modules.uniswap.constants import CPT_UNISWAP_V2
+from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants.assets import A_3CRV, A_BTC, A_ETH, A_EUR, A_WETH
 from rotkehlchen.constants.misc import ONE, ZERO
 from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.fval import FVal
-from rotkehlchen.tests.utils.factories import make_evm_address, make_random_bytes
-from rotkehlchen.types import CostBasisMethod, Location, Timestamp, make_evm_tx_hash
+from rotkehlchen.types import CostBasisMethod, Location, Timestamp, deserialize_evm_tx_hash
 
 
 @pytest.mark.parametrize('accounting_initialize_parameters', [True])
@@ -433,8 +433,10 @@ def test_reduce_asset_amount_exact(accountant):
 
 
 def test_reduce_asset_amount_not_bought(accountant):
-    asset = 'BTC'
-    assert not accountant.pots[0].cost_basis.reduce_asset_amount(asset, FVal(3), 0)
+    asset = A_BTC
+    cost_basis = accountant.pots[0].cost_basis
+    assert not cost_basis.reduce_asset_amount(asset, FVal(3), 0)
+    assert asset.identifier not in cost_basis._events  # no events are created for the asset
 
 
 def test_reduce_asset_amount_more_than_bought(accountant):
@@ -610,6 +612,30 @@ def test_accounting_simple_hifo_order(accountant):
     assert len(acquisitions) == 2 and acquisitions[0] == event2 and acquisitions[1] == event1
 
 
+def test_accounting_hifo_order_equal_amounts(accountant):
+    """Test that HIFO acquisitions with equal amounts are consumed in the order they were added
+    and that get_acquisitions returns them in the order they will be consumed"""
+    asset = A_BTC
+    cost_basis = accountant.pots[0].cost_basis
+    cost_basis.reset(DBSettings(cost_basis_method=CostBasisMethod.HIFO))
+    asset_events = cost_basis.get_events(asset)
+    events = [AssetAcquisitionEvent(
+        amount=amount,
+        timestamp=timestamp,
+        rate=ONE,
+        index=idx,
+    ) for idx, (amount, timestamp) in enumerate(((ONE, 3), (FVal(2), 1), (ONE, 2), (ONE, 1)))]
+    for event in events:
+        asset_events.acquisitions_manager.add_acquisition(event)
+
+    expected_order = [events[1], events[0], events[2], events[3]]
+    assert list(asset_events.acquisitions_manager.get_acquisitions()) == expected_order
+    for expected_event in expected_order:
+        assert asset_events.acquisitions_manager.get_acquisitions()[0] == expected_event
+        assert cost_basis.reduce_asset_amount(asset, expected_event.amount, 4) is True
+    assert len(asset_events.acquisitions_manager) == 0
+
+
 def test_accounting_hifo_order(accountant):
     asset = A_BTC
     cost_basis = accountant.pots[0].cost_basis
@@ -714,7 +740,6 @@ def test_missing_acquisitions(accountant):
     """Test that missing acquisitions are added properly by
     reduce_asset_amount and calculate_spend_cost_basis
     """
-    expected_missing_acquisitions = []
     cost_basis = accountant.pots[0].cost_basis
     all_events = cost_basis.get_events(A_ETH)
     # Test when there are no documented acquisitions
@@ -723,7 +748,7 @@ def test_missing_acquisitions(accountant):
         amount=1,
         timestamp=1,
     )
-    assert cost_basis.missing_acquisitions == expected_missing_acquisitions
+    assert cost_basis.missing_acquisitions == []
     all_events.acquisitions_manager.calculate_spend_cost_basis(
         spending_amount=1,
         spending_asset=A_ETH,
@@ -734,13 +759,12 @@ def test_missing_acquisitions(accountant):
         timestamp_to_date=cost_basis.timestamp_to_date,
         average_cost_basis=None,
     )
-    expected_missing_acquisitions.append(MissingAcquisition(
+    assert cost_basis.missing_acquisitions[-1] == MissingAcquisition(
         asset=A_ETH,
         missing_amount=1,
         found_amount=0,
         time=1,
-    ))
-    assert cost_basis.missing_acquisitions == expected_missing_acquisitions
+    )
     # Test when there are documented acquisitions (1 in this case)
     all_events.acquisitions_manager.add_acquisition(AssetAcquisitionEvent(
         amount=2,
@@ -753,13 +777,12 @@ def test_missing_acquisitions(accountant):
         amount=3,
         timestamp=3,
     )
-    expected_missing_acquisitions.append(MissingAcquisition(
+    assert cost_basis.missing_acquisitions[-1] == MissingAcquisition(
         asset=A_ETH,
         missing_amount=1,
         found_amount=2,
         time=3,
-    ))
-    assert cost_basis.missing_acquisitions == expected_missing_acquisitions
+    )
     all_events.acquisitions_manager.add_acquisition(AssetAcquisitionEvent(
         amount=2,
         rate=1,
@@ -776,13 +799,28 @@ def test_missing_acquisitions(accountant):
         timestamp_to_date=cost_basis.timestamp_to_date,
         average_cost_basis=None,
     )
-    expected_missing_acquisitions.append(MissingAcquisition(
+    assert cost_basis.missing_acquisitions[-1] == MissingAcquisition(
         asset=A_ETH,
         missing_amount=1,
         found_amount=2,
         time=4,
-    ))
-    assert cost_basis.missing_acquisitions == expected_missing_acquisitions
+    )
+    assert len(cost_basis.missing_acquisitions) == 3
+
+
+def _spend_with_average_cost_basis(cost_basis, asset, amount):
+    """Spend amount of the asset at timestamp 0 using its current average cost basis"""
+    asset_events = cost_basis.get_events(asset)
+    return asset_events.acquisitions_manager.calculate_spend_cost_basis(
+        spending_amount=amount,
+        spending_asset=asset,
+        timestamp=0,
+        missing_acquisitions=cost_basis.missing_acquisitions,
+        used_acquisitions=asset_events.used_acquisitions,
+        settings=cost_basis.settings,
+        timestamp_to_date=cost_basis.timestamp_to_date,
+        average_cost_basis=asset_events.acquisitions_manager.current_average_cost_basis,
+    )
 
 
 def test_accounting_average_cost_basis(accountant):
@@ -807,16 +845,7 @@ def test_accounting_average_cost_basis(accountant):
     asset_events.acquisitions_manager.add_acquisition(event1)
     assert asset_events.acquisitions_manager.remaining_amount == FVal(100)
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(5000)
-    cost_basis_result = asset_events.acquisitions_manager.calculate_spend_cost_basis(
-        spending_amount=FVal(50),
-        spending_asset=asset,
-        timestamp=0,
-        missing_acquisitions=cost_basis.missing_acquisitions,
-        used_acquisitions=asset_events.used_acquisitions,
-        settings=cost_basis.settings,
-        timestamp_to_date=cost_basis.timestamp_to_date,
-        average_cost_basis=asset_events.acquisitions_manager.current_average_cost_basis,
-    )
+    cost_basis_result = _spend_with_average_cost_basis(cost_basis, asset, FVal(50))
     assert asset_events.acquisitions_manager.remaining_amount == FVal(50)
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(2500)
     assert cost_basis_result.taxable_bought_cost == FVal(2500)
@@ -832,16 +861,7 @@ def test_accounting_average_cost_basis(accountant):
     ))
     assert asset_events.acquisitions_manager.remaining_amount == FVal(100)
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(9000)
-    cost_basis_result = asset_events.acquisitions_manager.calculate_spend_cost_basis(
-        spending_amount=FVal(40),
-        spending_asset=asset,
-        timestamp=0,
-        missing_acquisitions=cost_basis.missing_acquisitions,
-        used_acquisitions=asset_events.used_acquisitions,
-        settings=cost_basis.settings,
-        timestamp_to_date=cost_basis.timestamp_to_date,
-        average_cost_basis=asset_events.acquisitions_manager.current_average_cost_basis,
-    )
+    cost_basis_result = _spend_with_average_cost_basis(cost_basis, asset, FVal(40))
     assert asset_events.acquisitions_manager.remaining_amount == FVal(60)
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(5400)
     assert cost_basis_result.taxable_bought_cost == FVal(5400)
@@ -854,33 +874,24 @@ def test_accounting_average_cost_basis(accountant):
     asset_events = cost_basis.get_events(asset)
     assert asset_events.acquisitions_manager.remaining_amount == ZERO
     event3 = AssetAcquisitionEvent(
-        amount=FVal(1),
+        amount=ONE,
         timestamp=3,
         rate=FVal(100),
         index=3,
     )
     event4 = AssetAcquisitionEvent(
-        amount=FVal(1),
+        amount=ONE,
         timestamp=4,
         rate=FVal(200),
         index=4,
     )
     asset_events.acquisitions_manager.add_acquisition(event3)
-    assert asset_events.acquisitions_manager.remaining_amount == FVal(1)
+    assert asset_events.acquisitions_manager.remaining_amount == ONE
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(100)
     asset_events.acquisitions_manager.add_acquisition(event4)
     assert asset_events.acquisitions_manager.remaining_amount == FVal(2)
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(300)
-    cost_basis_result = asset_events.acquisitions_manager.calculate_spend_cost_basis(
-        spending_amount=FVal(0.5),
-        spending_asset=asset,
-        timestamp=0,
-        missing_acquisitions=cost_basis.missing_acquisitions,
-        used_acquisitions=asset_events.used_acquisitions,
-        settings=cost_basis.settings,
-        timestamp_to_date=cost_basis.timestamp_to_date,
-        average_cost_basis=asset_events.acquisitions_manager.current_average_cost_basis,
-    )
+    cost_basis_result = _spend_with_average_cost_basis(cost_basis, asset, FVal(0.5))
     assert asset_events.acquisitions_manager.remaining_amount == FVal(1.5)
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(225)
     assert cost_basis_result.is_complete is True
@@ -895,16 +906,7 @@ def test_accounting_average_cost_basis(accountant):
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(475)
 
     # see that using more than the available acquisitions adds a MissingAcquisition
-    assert asset_events.acquisitions_manager.calculate_spend_cost_basis(
-        spending_amount=FVal(3.5),
-        spending_asset=asset,
-        timestamp=0,
-        missing_acquisitions=cost_basis.missing_acquisitions,
-        used_acquisitions=asset_events.used_acquisitions,
-        settings=cost_basis.settings,
-        timestamp_to_date=cost_basis.timestamp_to_date,
-        average_cost_basis=asset_events.acquisitions_manager.current_average_cost_basis,
-    ).is_complete is False
+    assert _spend_with_average_cost_basis(cost_basis, asset, FVal(3.5)).is_complete is False
     assert asset_events.acquisitions_manager.remaining_amount == ZERO
     # it is negative due to the missing acquisition.
     assert asset_events.acquisitions_manager.current_average_cost_basis == FVal(-356.25)
@@ -927,14 +929,17 @@ def test_swaps_taxability(accountant, taxable):
     """Check taxable parameter works and acquisition part of swaps doesn't count as taxable."""
     pot = accountant.pots[0]
     transactions_accountant = pot.transactions
+    # both sides of the swap come from the same transaction of the same user address
+    tx_hash = deserialize_evm_tx_hash('0x8f06ea0f5c6a9e2d8d9c8a8ab1b2d4b3f6f4a2b8e3f1c3a6e8e9d3b2c1a0f4e5')  # noqa: E501
+    user_address = string_to_evm_address('0xfeF0E7635281eF8E3B705e9C5B86e1d3B0eAb397')
     transactions_accountant._process_tx_swap(
         timestamp=1469020840,
         out_event=HistoryBaseEntry(
-            event_identifier=make_evm_tx_hash(make_random_bytes(42)),
+            event_identifier=tx_hash,
             sequence_index=1,
             timestamp=Timestamp(1469020840),
             location=Location.BLOCKCHAIN,
-            location_label=make_evm_address(),
+            location_label=user_address,
             asset=A_ETH,
             balance=Balance(amount=ONE, usd_value=ONE),
             notes='Swap 0.15 ETH in uniswap-v2 from 0x3CAdf2cA458376a6a5feA2EF3612346037D5A787',
@@ -943,11 +948,11 @@ def test_swaps_taxability(accountant, taxable):
             counterparty=CPT_UNISWAP_V2,
         ),
         in_event=HistoryBaseEntry(
-            event_identifier=make_evm_tx_hash(make_random_bytes(42)),
+            event_identifier=tx_hash,
             sequence_index=2,
             timestamp=Timestamp(1469020840),
             location=Location.BLOCKCHAIN,
-            location_label=make_evm_address(),
+            location_label=user_address,
             asset=A_3CRV,
             balance=Balance(amount=ONE, usd_value=ONE),
             notes='Receive 462.967761432322996701 3CRV in uniswap-v2 from 0x3CAdf2cA458376a6a5feA2EF3612346037D5A787',  # noqa: E501
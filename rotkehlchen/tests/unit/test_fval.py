@@ -1,3 +1,5 @@
+from decimal import InvalidOperation
+
 import pytest
 
 from rotkehlchen.constants import ZERO
@@ -97,6 +99,20 @@ def test_int_comparison():
     assert e == c
 
 
+def test_nan_comparison():
+    """Test that ordering comparisons with NaN values signal instead of silently being False"""
+    a = FVal('NaN')
+    b = FVal('1')
+    with pytest.raises(InvalidOperation):
+        _ = a < b
+    with pytest.raises(InvalidOperation):
+        _ = a <= b
+    with pytest.raises(InvalidOperation):
+        _ = a > 1
+    with pytest.raises(InvalidOperation):
+        _ = b >= a
+
+
 def test_representation():
     a = FVal(2.01)
     b = FVal('2.01')
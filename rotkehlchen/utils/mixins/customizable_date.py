@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from rotkehlchen.types import Timestamp
@@ -8,6 +9,12 @@ if TYPE_CHECKING:
     from rotkehlchen.db.drivers.gevent import DBCursor
 
 
+# Events of a PnL report are serialized with their dates and often share timestamps,
+# so the date strings are cached per timestamp and date settings combination.
+TIMESTAMP_TO_DATE_CACHE_SIZE = 4096
+_cached_timestamp_to_date = lru_cache(maxsize=TIMESTAMP_TO_DATE_CACHE_SIZE)(timestamp_to_date)
+
+
 class CustomizableDateMixin():
 
     def __init__(self, database: 'DBHandler') -> None:
@@ -21,7 +28,7 @@ class CustomizableDateMixin():
 
     def timestamp_to_date(self, timestamp: Timestamp) -> str:
         """Turn the timestamp to a date string depending on the user DB settings"""
-        return timestamp_to_date(
+        return _cached_timestamp_to_date(
             timestamp,
             formatstr=self.settings.date_display_format,
             treat_as_local=self.settings.display_date_in_localtime,